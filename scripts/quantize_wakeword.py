@@ -0,0 +1,63 @@
+"""Quantize a wake word ONNX model to INT8.
+
+Dynamic INT8 quantization lets ONNX Runtime's CPU provider use its integer
+kernels (NEON dot-product on ARMv8.2+, VNNI on x86) for the wake word model,
+which runs on every 80ms frame while listening.
+
+Usage:
+    uv run --with onnx python scripts/quantize_wakeword.py [input.onnx] [output.onnx]
+
+Without arguments, the bundled "hey_jarvis" model is quantized to
+models/hey_jarvis.int8.onnx. Use the result with:
+
+    WakeWordConfig(model_path="models/hey_jarvis.int8.onnx")
+
+Re-check detection with your voice afterwards; the threshold may need a
+small adjustment.
+"""
+
+import argparse
+from pathlib import Path
+
+import onnxruntime as ort
+import openwakeword
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+
+def default_model_path() -> Path:
+    """Return the path of the bundled hey_jarvis ONNX model."""
+    return Path(openwakeword.MODELS["hey_jarvis"]["model_path"].replace(".tflite", ".onnx"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Quantize a wake word model to INT8.")
+    parser.add_argument("input", nargs="?", type=Path, default=None, help="FP32 .onnx model")
+    parser.add_argument(
+        "output",
+        nargs="?",
+        type=Path,
+        default=Path("models/hey_jarvis.int8.onnx"),
+        help="Quantized .onnx model",
+    )
+    args = parser.parse_args()
+
+    if args.input:
+        model_in = args.input
+        if not model_in.exists():
+            parser.error(f"{model_in} not found")
+    else:
+        model_in = default_model_path()
+        if not model_in.exists():
+            openwakeword.utils.download_models(model_names=["hey_jarvis"])
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    quantize_dynamic(str(model_in), str(args.output), weight_type=QuantType.QInt8)
+
+    session = ort.InferenceSession(str(args.output), providers=["CPUExecutionProvider"])
+    print(f"Quantized {model_in} -> {args.output}")
+    print(f"Providers: {session.get_providers()}")
+    print(f"Size: {model_in.stat().st_size} -> {args.output.stat().st_size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 """Voice assistant using Gemini Live API."""
 
+import logging
+
 from .assistant import AssistantState, VoiceAssistant
 from .config import AudioConfig, GeminiConfig, WakeWordConfig
 from .wakeword import WakeWordDetector
@@ -12,3 +14,5 @@ __all__ = [
     "WakeWordConfig",
     "WakeWordDetector",
 ]
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
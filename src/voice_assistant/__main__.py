@@ -1,11 +1,33 @@
 import asyncio
+import logging
+import queue
 import signal
+from logging.handlers import QueueHandler, QueueListener
 
 from .assistant import VoiceAssistant
 
+logger = logging.getLogger("voice_assistant")
+
+
+def _setup_logging() -> QueueListener:
+    """Log through a queue drained by a listener thread.
+
+    Writing to the terminal happens off the event loop, so slow output
+    never stalls audio streaming.
+    """
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, handler)
+    logging.basicConfig(level=logging.WARNING, handlers=[QueueHandler(log_queue)])
+    logger.setLevel(logging.INFO)
+    listener.start()
+    return listener
+
 
 def main() -> None:
     """Entry point for the voice assistant."""
+    listener = _setup_logging()
     assistant = VoiceAssistant()
 
     def handle_signal(sig, frame):
@@ -18,8 +40,9 @@ def main() -> None:
         asyncio.run(assistant.run())
     except KeyboardInterrupt:
         pass
-
-    print("Goodbye!")
+    finally:
+        logger.info("Goodbye!")
+        listener.stop()
 
 
 if __name__ == "__main__":
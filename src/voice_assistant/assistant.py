@@ -1,16 +1,23 @@
 import asyncio
+import contextlib
+import logging
+import math
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
 
+import numpy as np
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
 
-from .audio import AudioCapture, AudioPlayer
+from .audio import AudioCapture, AudioPlayer, pcm_rms
 from .config import AudioConfig, GeminiConfig, WakeWordConfig
 from .wakeword import WakeWordDetector
 
+logger = logging.getLogger(__name__)
+
 
 class AssistantState(Enum):
     """State machine states for the voice assistant."""
@@ -44,7 +51,10 @@ class VoiceAssistant:
         self._running = False
         self._state = AssistantState.LISTENING
         self._last_activity_time = 0.0
+        self._activity_event = asyncio.Event()
+        self._send_mime = f"audio/pcm;rate={self.audio_config.send_sample_rate}"
         self._wakeword_detector: WakeWordDetector | None = None
+        self._wakeword_executor: ThreadPoolExecutor | None = None
 
         # Initialize wake word detector if enabled
         if self.wakeword_config.enabled:
@@ -52,60 +62,166 @@ class VoiceAssistant:
                 model_path=self.wakeword_config.model_path,
                 threshold=self.wakeword_config.threshold,
                 inference_framework=self.wakeword_config.inference_framework,
+                ncpu=self.wakeword_config.ncpu,
+                vad_margin=self.wakeword_config.vad_margin,
+                skip_download=self.wakeword_config.skip_download,
+            )
+            # Persistent inference thread keeps the event loop free and the
+            # ONNX Runtime session warm on a single thread
+            self._wakeword_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="wakeword"
             )
 
-    async def _send_audio(self, session) -> None:
-        """Send audio from microphone to Gemini."""
-        async for chunk in self._capture.stream():
-            if not self._running or self._state == AssistantState.LISTENING:
-                break
-            await session.send(
-                input=types.LiveClientRealtimeInput(
-                    media_chunks=[
-                        types.Blob(
-                            data=chunk,
-                            mime_type=f"audio/pcm;rate={self.audio_config.send_sample_rate}",
-                        )
-                    ]
+    async def _capture_audio(self, queue: asyncio.Queue[bytes | None]) -> None:
+        """Move microphone frames into the send queue, dropping the oldest on overflow."""
+
+        def put(item: bytes | None) -> None:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(item)
+
+        # The capture ring hands out several chunks per frame, so each
+        # message carries send_coalesce chunks of audio
+        frame_samples = self.audio_config.chunk_size * self.audio_config.send_coalesce
+        barge_in_rms = self.audio_config.barge_in_rms
+        rms_frame = np.empty(frame_samples * self.audio_config.channels, dtype=np.float32)
+        try:
+            async for chunk in self._capture.stream(frame_samples):
+                if not self._running or self._state == AssistantState.LISTENING:
+                    break
+                # While Gemini responds or its reply is still playing, only
+                # loud speech (barge-in) is sent
+                responding = (
+                    self._state == AssistantState.RESPONDING or self._player.busy
                 )
-            )
-            self._last_activity_time = time.monotonic()
+                if responding and (
+                    barge_in_rms is None or pcm_rms(chunk, rms_frame) < barge_in_rms
+                ):
+                    continue
+                put(chunk)
+        finally:
+            put(None)
+
+    async def _send_audio(self, session) -> None:
+        """Send audio from microphone to Gemini.
+
+        Capture runs in its own task feeding a bounded queue, so a stalled
+        connection drops old audio instead of backing up the microphone.
+        """
+        frame_samples = self.audio_config.chunk_size * self.audio_config.send_coalesce
+        frame_ms = 1000 * frame_samples / self.audio_config.send_sample_rate
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(
+            maxsize=max(1, math.ceil(self.audio_config.send_backlog_ms / frame_ms))
+        )
+        capture_task = asyncio.create_task(self._capture_audio(queue))
+
+        # Build the message once and only swap its audio data per send;
+        # session.send serializes the message before returning
+        message = types.LiveClientRealtimeInput(
+            media_chunks=[types.Blob(mime_type=self._send_mime)]
+        )
+        blob = message.media_chunks[0]
+
+        # Bind hot-loop lookups once per session
+        send = session.send
+        get = queue.get
+        listening = AssistantState.LISTENING
+
+        try:
+            while (chunk := await get()) is not None:
+                if not self._running or self._state == listening:
+                    break
+                blob.data = chunk
+                await send(input=message)
+                self._bump_activity()
+        finally:
+            # Surface capture failures instead of dropping them with the task
+            capture_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await capture_task
+
+    async def _play_audio(self, queue: asyncio.Queue[bytes]) -> None:
+        """Feed received audio to the player without stalling the receive loop."""
+        while True:
+            await self._player.play(await queue.get())
+            # Queued audio may outlast turn_complete; keep the deadline behind it
+            self._bump_activity()
 
     async def _receive_audio(self, session) -> None:
         """Receive and play audio from Gemini."""
-        while self._running and self._state != AssistantState.LISTENING:
-            try:
-                async for response in session.receive():
-                    if not self._running or self._state == AssistantState.LISTENING:
-                        break
+        # Playback runs in its own task so an interruption is seen while the
+        # player is still waiting for buffer space
+        playback: asyncio.Queue[bytes] = asyncio.Queue()
+        play_task = asyncio.create_task(self._play_audio(playback))
+        try:
+            while self._running and self._state != AssistantState.LISTENING:
+                try:
+                    async for response in session.receive():
+                        if not self._running or self._state == AssistantState.LISTENING:
+                            break
+
+                        server_content = response.server_content
+                        if not server_content:
+                            continue
+
+                        if server_content.interrupted:
+                            # The user barged in; drop the rest of the reply
+                            while not playback.empty():
+                                playback.get_nowait()
+                            self._player.clear()
+                            self._state = AssistantState.ACTIVATED
+                            self._bump_activity()
+                            self._activity_event.set()
+                            continue
 
-                    server_content = response.server_content
-                    if server_content:
                         if server_content.model_turn:
                             self._state = AssistantState.RESPONDING
                             for part in server_content.model_turn.parts:
                                 if part.inline_data:
-                                    self._player.play_sync(part.inline_data.data)
+                                    playback.put_nowait(part.inline_data.data)
 
                         if server_content.turn_complete:
                             self._state = AssistantState.ACTIVATED
-                            self._last_activity_time = time.monotonic()
+                            self._bump_activity()
+                            # Restart the timeout deadline now the turn is over
+                            self._activity_event.set()
 
-            except Exception as e:
-                if self._running:
-                    print(f"Receive error: {e}")
-                break
+                except Exception as e:
+                    if self._running:
+                        logger.error("Receive error: %s", e)
+                    break
+        finally:
+            play_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await play_task
+
+    def _bump_activity(self) -> None:
+        """Record activity, pushing back the inactivity deadline."""
+        self._last_activity_time = time.monotonic()
 
     async def _check_timeout(self) -> None:
-        """Check for inactivity timeout and return to listening state."""
+        """Check for inactivity timeout and return to listening state.
+
+        Sleeps until the current deadline instead of polling. Activity only
+        moves the deadline forward; the event wakes the check early when a
+        response turn completes or the assistant shuts down.
+        """
         while self._running and self._state != AssistantState.LISTENING:
-            await asyncio.sleep(1.0)
-            if self._state == AssistantState.ACTIVATED:
-                elapsed = time.monotonic() - self._last_activity_time
-                if elapsed >= self.wakeword_config.timeout:
-                    print("\nTimeout - returning to wake word listening...")
-                    self._state = AssistantState.LISTENING
-                    break
+            remaining = self.wakeword_config.timeout - (
+                time.monotonic() - self._last_activity_time
+            )
+            if self._state == AssistantState.ACTIVATED and remaining <= 0:
+                logger.info("Timeout - returning to wake word listening...")
+                self._state = AssistantState.LISTENING
+                break
+
+            # No deadline while responding, wait for the turn to complete
+            deadline = remaining if self._state == AssistantState.ACTIVATED else None
+            try:
+                await asyncio.wait_for(self._activity_event.wait(), timeout=deadline)
+            except asyncio.TimeoutError:
+                pass
+            self._activity_event.clear()
 
     async def _listen_for_wakeword(self) -> bool:
         """Listen for wake word and return True when detected.
@@ -116,16 +232,21 @@ class VoiceAssistant:
         if not self._wakeword_detector:
             return True  # Wake word disabled, proceed immediately
 
-        print("Listening for wake word...")
-        self._wakeword_detector.reset()
+        logger.info("Listening for wake word...")
+        loop = asyncio.get_running_loop()
+        # Resetting reruns the embedding model, so keep it off the event loop
+        await loop.run_in_executor(self._wakeword_executor, self._wakeword_detector.reset)
 
-        async for chunk in self._capture.stream():
+        frame_samples = self._wakeword_detector.frame_samples
+        async for chunk in self._capture.stream(frame_samples):
             if not self._running:
                 return False
 
-            detected = self._wakeword_detector.process_audio(chunk)
+            detected = await loop.run_in_executor(
+                self._wakeword_executor, self._wakeword_detector.process_audio, chunk
+            )
             if detected:
-                print(f"\nWake word '{detected}' detected!")
+                logger.info("Wake word '%s' detected!", detected)
                 return True
 
         return False
@@ -133,7 +254,8 @@ class VoiceAssistant:
     async def _run_session(self) -> None:
         """Run a single Gemini session after wake word detection."""
         self._state = AssistantState.ACTIVATED
-        self._last_activity_time = time.monotonic()
+        self._bump_activity()
+        self._activity_event.clear()
 
         config = types.LiveConnectConfig(
             response_modalities=["AUDIO"],
@@ -147,31 +269,40 @@ class VoiceAssistant:
                 model=self.gemini_config.model,
                 config=config,
             ) as session:
-                print("Connected to Gemini. Listening for your question...\n")
+                logger.info("Connected to Gemini. Listening for your question...")
 
                 send_task = asyncio.create_task(self._send_audio(session))
                 receive_task = asyncio.create_task(self._receive_audio(session))
                 timeout_task = asyncio.create_task(self._check_timeout())
 
-                # Wait until we return to listening state or shutdown
-                await asyncio.gather(send_task, receive_task, timeout_task)
+                # Wait until any task ends (timeout, shutdown or error), then
+                # cancel the rest so the session and its buffers are released
+                done, pending = await asyncio.wait(
+                    {send_task, receive_task, timeout_task},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                for task in done:
+                    task.result()
 
         except Exception as e:
-            print(f"Session error: {e}")
+            logger.error("Session error: %s", e)
 
         self._state = AssistantState.LISTENING
 
     async def run(self) -> None:
         """Start the voice assistant with wake word detection."""
         if self.wakeword_config.enabled:
-            print("Starting voice assistant with wake word detection...")
-            print(f"Wake word model: {self._wakeword_detector.model_names}")
-            print(f"Threshold: {self.wakeword_config.threshold}")
-            print(f"Timeout: {self.wakeword_config.timeout}s")
+            logger.info("Starting voice assistant with wake word detection...")
+            logger.info("Wake word model: %s", self._wakeword_detector.model_names)
+            logger.info("Threshold: %s", self.wakeword_config.threshold)
+            logger.info("Timeout: %ss", self.wakeword_config.timeout)
         else:
-            print("Starting voice assistant (wake word disabled)...")
-        print(f"Model: {self.gemini_config.model}")
-        print("Press Ctrl+C to exit.\n")
+            logger.info("Starting voice assistant (wake word disabled)...")
+        logger.info("Model: %s", self.gemini_config.model)
+        logger.info("Press Ctrl+C to exit.")
 
         self._running = True
         self._capture.start()
@@ -193,16 +324,19 @@ class VoiceAssistant:
                     break
 
         except Exception as e:
-            print(f"Error: {e}")
+            logger.error("Error: %s", e)
         finally:
             self.shutdown()
+            if self._wakeword_executor:
+                self._wakeword_executor.shutdown(wait=False)
 
     def shutdown(self) -> None:
         """Clean up resources."""
         if not self._running:
             return
-        print("\nShutting down...")
+        logger.info("Shutting down...")
         self._running = False
         self._state = AssistantState.LISTENING
+        self._activity_event.set()
         self._capture.stop()
         self._player.stop()
@@ -1,12 +1,17 @@
 import asyncio
+import logging
+import os
 import struct
 import threading
+import time
+import numpy as np
 import pyaudio
-from collections import deque
 from collections.abc import AsyncGenerator
 
 from .config import AudioConfig
 
+logger = logging.getLogger(__name__)
+
 
 def resample_linear(data: bytes, from_rate: int, to_rate: int) -> bytes:
     """Resample 16-bit PCM audio using linear interpolation."""
@@ -37,34 +42,155 @@ def resample_linear(data: bytes, from_rate: int, to_rate: int) -> bytes:
     return struct.pack(f'<{len(resampled)}h', *resampled)
 
 
+def pcm_rms(data: bytes | np.ndarray, out: np.ndarray | None = None) -> float:
+    """Return the RMS level of 16-bit PCM audio.
+
+    Args:
+        data: Raw PCM bytes or an int16 sample array.
+        out: Optional float32 buffer at least as long as the audio, used for
+            the conversion instead of allocating a temporary array.
+    """
+    samples = np.frombuffer(data, dtype=np.int16) if isinstance(data, bytes) else data
+    if not len(samples):
+        return 0.0
+    if out is None:
+        floats = samples.astype(np.float32)
+    else:
+        floats = out[: len(samples)]
+        np.copyto(floats, samples)
+    return float(np.sqrt(np.dot(floats, floats) / len(floats)))
+
+
+def _promote_audio_thread(config: AudioConfig) -> None:
+    """Pin the calling audio thread to a CPU and switch it to SCHED_FIFO.
+
+    Failures (missing privileges, CPU or OS support) are logged and the
+    thread keeps running with default scheduling.
+    """
+    if config.audio_cpu is not None and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {config.audio_cpu})
+        except OSError as e:
+            logger.warning("Could not pin audio thread to CPU %d: %s", config.audio_cpu, e)
+    if config.audio_priority is not None and hasattr(os, "sched_setscheduler"):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(config.audio_priority))
+        except OSError as e:
+            logger.warning("Could not set real-time priority for audio thread: %s", e)
+
+
+class _RingBuffer:
+    """Fixed-size byte ring shared between the audio thread and the event loop.
+
+    The writer never blocks: when the ring is full the oldest bytes are
+    dropped, so the capacity should be a multiple of the frame size.
+    """
+
+    def __init__(self, capacity: int):
+        self._data = bytearray(capacity)
+        self._view = memoryview(self._data)
+        self._capacity = capacity
+        self._head = 0  # Total bytes written
+        self._tail = 0  # Total bytes read
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._head - self._tail
+
+    def free(self) -> int:
+        """Return the number of bytes that can be written without dropping data."""
+        with self._lock:
+            return self._capacity - (self._head - self._tail)
+
+    def write(self, data: bytes | memoryview) -> int:
+        """Append data, overwriting the oldest bytes if full.
+
+        Returns:
+            Number of bytes available to read after the write.
+        """
+        src = memoryview(data)[-self._capacity :]
+        n = len(src)
+        with self._lock:
+            start = self._head % self._capacity
+            first = min(n, self._capacity - start)
+            self._view[start : start + first] = src[:first]
+            self._view[: n - first] = src[first:]
+            self._head += n
+            if self._head - self._tail > self._capacity:
+                self._tail = self._head - self._capacity
+            return self._head - self._tail
+
+    def read(self, n: int) -> bytes | None:
+        """Remove and return exactly n bytes, or None if fewer are available."""
+        with self._lock:
+            if self._head - self._tail < n:
+                return None
+            start = self._tail % self._capacity
+            first = min(n, self._capacity - start)
+            if first == n:
+                data = bytes(self._view[start : start + n])
+            else:
+                data = bytes(self._view[start:]) + bytes(self._view[: n - first])
+            self._tail += n
+            return data
+
+    def read_upto(self, n: int) -> bytes:
+        """Remove and return up to n bytes, possibly fewer or none."""
+        with self._lock:
+            n = min(n, self._head - self._tail)
+            start = self._tail % self._capacity
+            first = min(n, self._capacity - start)
+            data = bytes(self._view[start : start + first]) + bytes(self._view[: n - first])
+            self._tail += n
+            return data
+
+    def clear(self) -> None:
+        """Discard all buffered data."""
+        with self._lock:
+            self._tail = self._head
+
+
 class AudioCapture:
-    """Captures audio from microphone using callback mode."""
+    """Captures audio from microphone using callback mode.
+
+    The PyAudio callback copies samples into a ring buffer and only wakes
+    the event loop once a full frame for the current consumer is available.
+    """
 
     def __init__(self, config: AudioConfig):
         self.config = config
         self._pyaudio: pyaudio.PyAudio | None = None
         self._stream: pyaudio.Stream | None = None
         self._running = False
-        self._buffer: deque[bytes] = deque(maxlen=100)
-        self._lock = threading.Lock()
+        self._bytes_per_sample = config.channels * config.format_width
+        self._buffer = _RingBuffer(config.chunk_size * self._bytes_per_sample * 100)
+        self._frame_bytes = config.chunk_size * self._bytes_per_sample
+        self._loop: asyncio.AbstractEventLoop | None = None
         self._event = asyncio.Event()
+        self._promote_pending = False
 
     def _audio_callback(self, in_data, frame_count, time_info, status):
         """PyAudio callback for capturing audio."""
+        if self._promote_pending:
+            self._promote_pending = False
+            _promote_audio_thread(self.config)
         if self._running:
-            with self._lock:
-                self._buffer.append(in_data)
-            # Signal that new data is available
-            try:
-                self._event.set()
-            except RuntimeError:
-                pass  # Event loop might not be running
+            available = self._buffer.write(in_data)
+            # Wake the consumer only when this write completed a frame
+            loop = self._loop
+            if loop and available - len(in_data) < self._frame_bytes <= available:
+                try:
+                    loop.call_soon_threadsafe(self._event.set)
+                except RuntimeError:
+                    pass  # Event loop already closed
         return (None, pyaudio.paContinue)
 
     def start(self) -> None:
         """Initialize and start the audio capture stream."""
         self._pyaudio = pyaudio.PyAudio()
         self._running = True
+        self._promote_pending = True
         self._stream = self._pyaudio.open(
             format=pyaudio.paInt16,
             channels=self.config.channels,
@@ -95,36 +221,61 @@ class AudioCapture:
             except Exception:
                 pass
 
-    async def stream(self) -> AsyncGenerator[bytes, None]:
-        """Async generator that yields audio chunks from the microphone."""
+    async def stream(self, frame_samples: int | None = None) -> AsyncGenerator[bytes, None]:
+        """Async generator that yields audio frames from the microphone.
+
+        Args:
+            frame_samples: Samples per yielded frame, defaults to chunk_size.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._frame_bytes = (frame_samples or self.config.chunk_size) * self._bytes_per_sample
         while self._running:
-            # Wait for data or timeout
+            # Get all complete frames
+            while (data := self._buffer.read(self._frame_bytes)) is not None:
+                yield data
+
+            # Wait for the next complete frame or timeout
             try:
                 await asyncio.wait_for(self._event.wait(), timeout=0.1)
                 self._event.clear()
             except asyncio.TimeoutError:
                 continue
 
-            # Get all available data
-            while True:
-                with self._lock:
-                    if not self._buffer:
-                        break
-                    data = self._buffer.popleft()
-                yield data
-
 
 class AudioPlayer:
-    """Plays audio to the speaker."""
+    """Plays audio to the speaker.
+
+    Audio is resampled and copied into a ring buffer that a PyAudio callback
+    drains at the device rate, so writers never block on the sound card.
+    """
 
     def __init__(self, config: AudioConfig):
         self.config = config
         self._pyaudio: pyaudio.PyAudio | None = None
         self._stream: pyaudio.Stream | None = None
         self._running = False
+        self._bytes_per_sample = config.channels * config.format_width
+        # Two seconds of playback audio
+        self._buffer = _RingBuffer(config.playback_sample_rate * self._bytes_per_sample * 2)
+        self._promote_pending = False
+        # Bumped by clear() so pending play() calls drop their remaining audio
+        self._generation = 0
+
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback for playing audio, padding underruns with silence."""
+        if self._promote_pending:
+            self._promote_pending = False
+            _promote_audio_thread(self.config)
+        n = frame_count * self._bytes_per_sample
+        data = self._buffer.read_upto(n)
+        if len(data) < n:
+            data += bytes(n - len(data))
+        return (data, pyaudio.paContinue)
 
     def start(self) -> None:
         """Initialize and start the audio playback stream."""
+        self._buffer.clear()
+        self._promote_pending = True
         self._pyaudio = pyaudio.PyAudio()
         self._stream = self._pyaudio.open(
             format=pyaudio.paInt16,
@@ -133,6 +284,7 @@ class AudioPlayer:
             output=True,
             output_device_index=self.config.output_device_index,
             frames_per_buffer=self.config.chunk_size,
+            stream_callback=self._audio_callback,
         )
         self._running = True
 
@@ -155,31 +307,53 @@ class AudioPlayer:
             except Exception:
                 pass
 
-    async def play(self, queue: asyncio.Queue[bytes | None]) -> None:
-        """Play audio from queue until None is received or stopped."""
-        loop = asyncio.get_event_loop()
-        while self._running:
-            try:
-                data = await asyncio.wait_for(queue.get(), timeout=0.1)
-                if data is None:
-                    break
-                resampled = resample_linear(
-                    data,
-                    self.config.receive_sample_rate,
-                    self.config.playback_sample_rate
-                )
-                await loop.run_in_executor(None, self._stream.write, resampled)
-            except asyncio.TimeoutError:
-                continue
-            except Exception:
-                break
+    def _resample(self, data: bytes) -> memoryview:
+        """Resample received audio to the playback rate."""
+        return memoryview(resample_linear(
+            data,
+            self.config.receive_sample_rate,
+            self.config.playback_sample_rate
+        ))
+
+    @property
+    def busy(self) -> bool:
+        """Return True while queued audio is still waiting to be played."""
+        return len(self._buffer) > 0
+
+    def _fill(self, pending: memoryview) -> memoryview:
+        """Copy as much pending audio as fits into the buffer, returning the rest."""
+        room = self._buffer.free()
+        if room:
+            self._buffer.write(pending[:room])
+        return pending[room:]
+
+    async def play(self, data: bytes) -> None:
+        """Queue audio data for playback (with resampling).
+
+        Waits without blocking the event loop while the buffer is full and
+        gives up if clear() is called in the meantime.
+        """
+        generation = self._generation
+        pending = self._fill(self._resample(data))
+        while pending and self._running:
+            await asyncio.sleep(0.005)
+            if generation != self._generation:
+                return
+            pending = self._fill(pending)
 
     def play_sync(self, data: bytes) -> None:
-        """Synchronously write audio data to the stream (with resampling)."""
-        if self._stream and self._running:
-            resampled = resample_linear(
-                data,
-                self.config.receive_sample_rate,
-                self.config.playback_sample_rate
-            )
-            self._stream.write(resampled)
+        """Synchronously queue audio data for playback (with resampling)."""
+        pending = self._fill(self._resample(data))
+        while pending and self._running:
+            time.sleep(0.005)
+            pending = self._fill(pending)
+
+    def clear(self) -> None:
+        """Discard all queued audio, e.g. when the response was interrupted."""
+        self._generation += 1
+        self._buffer.clear()
+
+    def drain(self) -> None:
+        """Block until all queued audio has been played."""
+        while len(self._buffer) and self._running:
+            time.sleep(0.005)
@@ -1,27 +1,32 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AudioConfig:
     """Audio configuration for microphone input and speaker output."""
     send_sample_rate: int = 16000      # Input sample rate (mic) - Gemini expects 16kHz
     receive_sample_rate: int = 24000   # Output sample rate from Gemini (24kHz)
     playback_sample_rate: int = 16000  # Actual playback rate (must match input for WM8960)
     chunk_size: int = 1024             # Audio chunk size in frames
+    send_coalesce: int = 3             # Chunks batched into one Gemini message (~192ms)
+    send_backlog_ms: int = 500         # Max unsent audio queued before dropping the oldest
+    barge_in_rms: float | None = 1000.0  # Mic RMS needed to send while Gemini responds (None = never)
     channels: int = 1                  # Mono audio
     format_width: int = 2              # 16-bit PCM (2 bytes)
     input_device_index: int | None = 1   # WM8960 mic input (hw:1,0)
     output_device_index: int | None = 1  # WM8960 speaker output (hw:1,0)
+    audio_cpu: int | None = None         # CPU to pin audio callback threads to (None = any)
+    audio_priority: int | None = None    # SCHED_FIFO priority for audio threads (None = default)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GeminiConfig:
     """Configuration for Gemini Live API."""
     model: str = "gemini-2.5-flash-native-audio-preview-12-2025"
     system_instruction: str = "You are a helpful, friendly voice assistant."
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WakeWordConfig:
     """Configuration for wake word detection."""
     enabled: bool = True                  # Enable/disable wake word detection
@@ -29,3 +34,6 @@ class WakeWordConfig:
     threshold: float = 0.5                # Detection confidence threshold (0.0-1.0)
     timeout: float = 30.0                 # Seconds of silence before returning to listening
     inference_framework: str = "onnx"     # "onnx" or "tflite"
+    ncpu: int = 1                         # Inference threads for audio feature models
+    vad_margin: float = 1.4               # Skip inference below margin x noise floor (0 = off)
+    skip_download: bool = False           # Never download models (pre-installed deployments)
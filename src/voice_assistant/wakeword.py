@@ -1,15 +1,34 @@
 """Wake word detection using openWakeWord."""
 
+from pathlib import Path
+
 import numpy as np
 import openwakeword
 from openwakeword.model import Model
 
+from .audio import pcm_rms
+
+# Energy gate tuning, in 80ms frames and int16 RMS units
+_VAD_HANGOVER_FRAMES = 12   # Keep running inference ~1s after the last loud frame
+_VAD_FLOOR_RELEASE = 1.005  # Noise floor rises at most ~6%/s
+_VAD_MIN_NOISE_FLOOR = 10.0
+
+
+def _models_downloaded(inference_framework: str, include_default: bool) -> bool:
+    """Check whether the openWakeWord model files needed at runtime exist."""
+    paths = [model["model_path"] for model in openwakeword.FEATURE_MODELS.values()]
+    if include_default:
+        paths.append(openwakeword.MODELS["hey_jarvis"]["model_path"])
+    ext = ".onnx" if inference_framework == "onnx" else ".tflite"
+    return all(Path(path.replace(".tflite", ext)).exists() for path in paths)
+
 
 class WakeWordDetector:
     """Local wake word detection using openWakeWord.
 
     openWakeWord processes audio in 80ms chunks (1280 samples at 16kHz).
-    Smaller chunks are buffered until enough data is available.
+    Smaller chunks are buffered until enough data is available. Frames whose
+    energy stays near the tracked noise floor skip inference.
     """
 
     def __init__(
@@ -17,6 +36,9 @@ class WakeWordDetector:
         model_path: str | None = None,
         threshold: float = 0.5,
         inference_framework: str = "onnx",
+        ncpu: int = 1,
+        vad_margin: float = 1.4,
+        skip_download: bool = False,
     ):
         """Initialize the wake word detector.
 
@@ -24,30 +46,62 @@ class WakeWordDetector:
             model_path: Path to custom .onnx model, or None to use "hey_jarvis".
             threshold: Detection confidence threshold (0.0 to 1.0).
             inference_framework: Inference backend ("onnx" or "tflite").
+            ncpu: Threads for the melspectrogram and embedding models.
+            vad_margin: Skip inference on frames below this multiple of the
+                noise floor RMS (0 disables the energy gate).
+            skip_download: Never download models, e.g. when they are
+                installed ahead of time.
         """
         # Download default models if needed
-        openwakeword.utils.download_models()
+        if not skip_download and not _models_downloaded(
+            inference_framework, include_default=not model_path
+        ):
+            openwakeword.utils.download_models()
 
         # Load the model
         if model_path:
             self.model = Model(
                 wakeword_models=[model_path],
                 inference_framework=inference_framework,
+                ncpu=ncpu,
             )
             self._model_names = [model_path.split("/")[-1].replace(".onnx", "")]
         else:
             self.model = Model(
                 wakeword_models=["hey_jarvis"],
                 inference_framework=inference_framework,
+                ncpu=ncpu,
             )
             self._model_names = ["hey_jarvis"]
 
         self.threshold = threshold
-        self._buffer = np.array([], dtype=np.int16)
+        self.vad_margin = vad_margin
+        self._noise_floor = float("inf")  # Set by the first frame
+        self._hangover = 0
 
         # openWakeWord expects 80ms frames (1280 samples at 16kHz)
         self._chunk_samples = 1280
 
+        # Preallocated sample buffer: incoming audio is written at _write,
+        # complete frames are consumed from _read. The unread tail is moved
+        # back to the start only when the next chunk would not fit.
+        self._buffer = np.empty(self._chunk_samples * 4, dtype=np.int16)
+        self._buffer_bytes = self._buffer.data.cast("B")
+        self._read = 0
+        self._write = 0
+
+        # Preallocated float32 frame for the energy gate
+        self._float_frame = np.empty(self._chunk_samples, dtype=np.float32)
+
+        # Warm up the inference session so the first real frame doesn't pay
+        # for graph optimization, and cache score names in prediction order
+        warmup = self.model.predict(np.zeros(self._chunk_samples, dtype=np.int16))
+        self._score_names = tuple(warmup)
+        self.model.reset()
+
+        # With a single score the vector scan can be skipped entirely
+        self._single = self._score_names[0] if len(self._score_names) == 1 else None
+
     def process_audio(self, audio_chunk: bytes) -> str | None:
         """Process 16kHz 16-bit PCM audio and detect wake words.
 
@@ -57,32 +111,84 @@ class WakeWordDetector:
         Returns:
             Name of detected wake word, or None if no detection.
         """
-        # Convert bytes to numpy array
-        audio_array = np.frombuffer(audio_chunk, dtype=np.int16)
-
-        # Append to buffer
-        self._buffer = np.concatenate([self._buffer, audio_array])
+        n = len(audio_chunk) // 2
+
+        # Make room for the new samples
+        if self._write + n > len(self._buffer):
+            pending = self._write - self._read
+            if pending + n > len(self._buffer):
+                grown = np.empty(pending + n + self._chunk_samples, dtype=np.int16)
+                grown[:pending] = self._buffer[self._read : self._write]
+                self._buffer = grown
+                self._buffer_bytes = self._buffer.data.cast("B")
+            else:
+                self._buffer[:pending] = self._buffer[self._read : self._write]
+            self._read = 0
+            self._write = pending
+
+        # Copy the raw PCM bytes straight into the buffer
+        self._buffer_bytes[self._write * 2 : (self._write + n) * 2] = audio_chunk
+        self._write += n
 
         # Process complete 80ms chunks
-        while len(self._buffer) >= self._chunk_samples:
-            chunk = self._buffer[: self._chunk_samples]
-            self._buffer = self._buffer[self._chunk_samples :]
+        while self._write - self._read >= self._chunk_samples:
+            chunk = self._buffer[self._read : self._read + self._chunk_samples]
+            self._read += self._chunk_samples
+
+            if self.vad_margin and self._is_silence(chunk):
+                continue
 
             # Get prediction scores
             prediction = self.model.predict(chunk)
 
-            # Check each wake word against threshold
-            for wake_word, score in prediction.items():
-                if score >= self.threshold:
+            if self._single:
+                if prediction[self._single] >= self.threshold:
                     self.reset()
-                    return wake_word
+                    return self._single
+                continue
+
+            # Check the best scoring wake word against threshold
+            scores = np.fromiter(
+                prediction.values(), dtype=np.float32, count=len(prediction)
+            )
+            best = int(scores.argmax())
+            if scores[best] >= self.threshold:
+                self.reset()
+                return self._score_names[best]
 
         return None
 
+    def _is_silence(self, chunk: np.ndarray) -> bool:
+        """Track the noise floor and report whether a frame can skip inference."""
+        rms = pcm_rms(chunk, self._float_frame)
+
+        # Minimum tracking: the floor drops to any quieter frame and otherwise
+        # rises slowly, so speech and other loud audio barely move it while
+        # pauses pull it back to the background level
+        if rms < self._noise_floor:
+            self._noise_floor = max(_VAD_MIN_NOISE_FLOOR, rms)
+        else:
+            self._noise_floor = min(rms, self._noise_floor * _VAD_FLOOR_RELEASE)
+
+        if rms > self._noise_floor * self.vad_margin:
+            self._hangover = _VAD_HANGOVER_FRAMES
+            return False
+        if self._hangover:
+            self._hangover -= 1
+            return False
+        return True
+
     def reset(self) -> None:
         """Reset detection state and clear buffer."""
         self.model.reset()
-        self._buffer = np.array([], dtype=np.int16)
+        self._read = 0
+        self._write = 0
+        self._hangover = 0
+
+    @property
+    def frame_samples(self) -> int:
+        """Return the number of samples consumed per model prediction."""
+        return self._chunk_samples
 
     @property
     def model_names(self) -> list[str]:
@@ -206,6 +206,254 @@ def test_audio_capture_read():
     return True
 
 
+def test_ring_buffer():
+    """Test the capture ring buffer wraps and drops the oldest data."""
+    print("Testing ring buffer...")
+
+    from voice_assistant.audio import _RingBuffer
+
+    ring = _RingBuffer(8)
+    assert ring.write(b"abcdef") == 6, "Wrong available count"
+    assert ring.read(4) == b"abcd", "Wrong read"
+    assert ring.read(4) is None, "Partial read should return None"
+
+    # Wraps around the end of the buffer
+    assert ring.write(b"ghijkl") == 8, "Wrong available count after wrap"
+    assert ring.read(8) == b"efghijkl", "Wrong read across wrap"
+
+    # Overflow drops the oldest bytes
+    ring.write(b"0123456789")
+    assert len(ring) == 8, "Ring should be full"
+    assert ring.read(8) == b"23456789", "Oldest bytes should be dropped"
+
+    print("  Ring buffer correct")
+    return True
+
+
+def test_wakeword_energy_gate():
+    """Test the wake word energy gate and noise floor tracking."""
+    print("Testing wake word energy gate...")
+
+    import numpy as np
+    from voice_assistant import wakeword
+
+    class StubModel:
+        def __init__(self, **kwargs):
+            self.calls = 0
+
+        def predict(self, x):
+            self.calls += 1
+            return {"hey_jarvis": 0.0}
+
+        def reset(self):
+            pass
+
+    original_model = wakeword.Model
+    wakeword.Model = StubModel
+    try:
+        detector = wakeword.WakeWordDetector(skip_download=True)
+    finally:
+        wakeword.Model = original_model
+
+    rng = np.random.default_rng(0)
+
+    def predictions(rms: float, frames: int) -> int:
+        """Feed noise at the given RMS and return the number of model calls."""
+        start = detector.model.calls
+        audio = rng.normal(0, rms, detector.frame_samples * frames)
+        detector.process_audio(audio.clip(-32768, 32767).astype(np.int16).tobytes())
+        return detector.model.calls - start
+
+    # Noise floor settles on steady background noise, then quiet frames skip
+    predictions(50, 20)
+    assert 40 < detector._noise_floor < 60, "Noise floor should track background"
+    assert predictions(50, 50) == 0, "Quiet frames should skip inference"
+
+    # Loud frames run inference, followed by the hangover
+    assert predictions(3000, 5) == 5, "Loud frames should run inference"
+    assert predictions(50, 20) == wakeword._VAD_HANGOVER_FRAMES, "Wrong hangover"
+
+    # Noise floor rises slowly with louder background
+    assert predictions(500, 100) == 100, "Floor should not jump to loud audio"
+    predictions(500, 500)
+    assert 400 < detector._noise_floor < 600, "Noise floor should rise to background"
+    assert predictions(500, 20) == 0, "Louder background should skip inference"
+
+    # Speech over steady loud background still runs inference
+    predictions(2000, 400)
+    assert predictions(2000, 20) == 0, "Steady background should skip inference"
+    assert predictions(3000, 5) == 5, "Speech over background should run inference"
+
+    # Disabled gate runs inference on every frame
+    detector.vad_margin = 0.0
+    assert predictions(50, 5) == 5, "Disabled gate should run inference"
+
+    print("  Energy gate correct")
+    return True
+
+
+def make_offline_assistant(timeout: float = 30.0):
+    """Create a VoiceAssistant without wake word detection or audio streams."""
+    from voice_assistant import VoiceAssistant, WakeWordConfig
+
+    original_key = os.environ.get("GEMINI_API_KEY")
+    os.environ.setdefault("GEMINI_API_KEY", "test-key")
+    try:
+        return VoiceAssistant(
+            wakeword_config=WakeWordConfig(enabled=False, timeout=timeout)
+        )
+    finally:
+        if original_key is None:
+            os.environ.pop("GEMINI_API_KEY", None)
+
+
+def test_session_timeout():
+    """Test the inactivity timeout is deadline driven and paused while responding."""
+    print("Testing session timeout...")
+
+    import time
+    from types import SimpleNamespace
+
+    from voice_assistant import AssistantState
+
+    timeout = 0.2
+    assistant = make_offline_assistant(timeout)
+
+    def response(**server_content):
+        content = dict(model_turn=None, turn_complete=None, interrupted=None)
+        content.update(server_content)
+        return SimpleNamespace(server_content=SimpleNamespace(**content))
+
+    turn_completed_at = 0.0
+
+    class FakeSession:
+        async def receive(self):
+            nonlocal turn_completed_at
+            yield response(model_turn=SimpleNamespace(parts=[]))
+            # Still responding well past the timeout
+            await asyncio.sleep(timeout * 3)
+            turn_completed_at = time.monotonic()
+            yield response(turn_complete=True)
+            await asyncio.Event().wait()
+
+    async def run_timeout():
+        assistant._running = True
+        assistant._state = AssistantState.ACTIVATED
+        assistant._bump_activity()
+        receive_task = asyncio.create_task(assistant._receive_audio(FakeSession()))
+        try:
+            await asyncio.wait_for(assistant._check_timeout(), timeout * 10)
+        finally:
+            receive_task.cancel()
+        return time.monotonic()
+
+    timed_out_at = asyncio.run(run_timeout())
+    assert turn_completed_at, "Timeout fired while responding"
+    elapsed = timed_out_at - turn_completed_at
+    assert timeout * 0.9 <= elapsed < timeout * 2, f"Timeout after {elapsed:.3f}s"
+    assert assistant._state == AssistantState.LISTENING, "Should return to listening"
+    print(f"  Timed out {elapsed:.3f}s after turn complete")
+
+    # Shutdown wakes a check that has no deadline while responding
+    assistant = make_offline_assistant(timeout)
+
+    async def run_shutdown():
+        assistant._running = True
+        assistant._state = AssistantState.RESPONDING
+        task = asyncio.create_task(assistant._check_timeout())
+        await asyncio.sleep(timeout)
+        assert not task.done(), "Timeout should wait while responding"
+        assistant.shutdown()
+        await asyncio.wait_for(task, timeout)
+
+    asyncio.run(run_shutdown())
+    print("  Shutdown wakes the timeout check")
+    return True
+
+
+def test_playback_interrupt():
+    """Test an interrupted response discards queued and pending playback."""
+    print("Testing playback interruption...")
+
+    from types import SimpleNamespace
+
+    from voice_assistant import AssistantState
+
+    assistant = make_offline_assistant()
+    player = assistant._player
+    config = assistant.audio_config
+    # One second of silence per part; three parts overflow the playback buffer
+    second = bytes(config.receive_sample_rate * config.format_width)
+    parts = [SimpleNamespace(inline_data=SimpleNamespace(data=second)) for _ in range(3)]
+    interrupted = asyncio.Event()
+
+    def response(**server_content):
+        content = dict(model_turn=None, turn_complete=None, interrupted=None)
+        content.update(server_content)
+        return SimpleNamespace(server_content=SimpleNamespace(**content))
+
+    class FakeSession:
+        async def receive(self):
+            yield response(model_turn=SimpleNamespace(parts=parts))
+            # Let playback fill the buffer, nothing drains it without a stream
+            await asyncio.sleep(0.05)
+            yield response(interrupted=True)
+            interrupted.set()
+            await asyncio.Event().wait()
+
+    async def run_interrupt():
+        assistant._running = True
+        assistant._state = AssistantState.ACTIVATED
+        player._running = True
+        receive_task = asyncio.create_task(assistant._receive_audio(FakeSession()))
+        try:
+            await asyncio.wait_for(interrupted.wait(), 1.0)
+            await asyncio.sleep(0.05)
+        finally:
+            receive_task.cancel()
+            await asyncio.gather(receive_task, return_exceptions=True)
+
+    asyncio.run(run_interrupt())
+    assert not player.busy, "Interrupt should clear queued playback"
+    assert assistant._state == AssistantState.ACTIVATED, "Should wait for the next turn"
+
+    print("  Interrupted response discarded")
+    return True
+
+
+def test_send_queue_drops_oldest():
+    """Test the send queue keeps only the newest frames on overflow."""
+    print("Testing send queue overflow...")
+
+    from voice_assistant import AssistantState
+
+    assistant = make_offline_assistant()
+    config = assistant.audio_config
+    frame_bytes = config.chunk_size * config.send_coalesce * config.format_width
+    frames = [bytes([i]) * frame_bytes for i in range(5)]
+
+    async def run_capture():
+        assistant._running = True
+        assistant._state = AssistantState.ACTIVATED
+        assistant._capture._running = True
+        for frame in frames:
+            assistant._capture._audio_callback(frame, config.chunk_size, None, 0)
+
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=3)
+        task = asyncio.create_task(assistant._capture_audio(queue))
+        await asyncio.sleep(0.05)
+        queued = [queue.get_nowait() for _ in range(queue.qsize())]
+        assistant._capture._running = False
+        await asyncio.wait_for(task, 1.0)
+        return queued
+
+    queued = asyncio.run(run_capture())
+    assert queued == frames[-3:], "Queue should hold the newest frames"
+
+    print("  Oldest frames dropped")
+    return True
+
+
 def test_audio_playback():
     """Test playing a short tone."""
     print("Testing AudioPlayer playback (1 second tone)...")
@@ -241,6 +489,7 @@ def test_audio_playback():
         for i in range(0, len(audio_data), chunk_size):
             chunk = audio_data[i:i + chunk_size]
             player.play_sync(chunk)
+        player.drain()
         print("  Played 440Hz tone for 1 second (resampled 24kHz -> 48kHz)")
     finally:
         player.stop()
@@ -315,6 +564,11 @@ def run_all_tests():
         ("AudioCapture Start/Stop", test_audio_capture_start_stop),
         ("AudioPlayer Start/Stop", test_audio_player_start_stop),
         ("AudioCapture Read", test_audio_capture_read),
+        ("Ring Buffer", test_ring_buffer),
+        ("Wake Word Energy Gate", test_wakeword_energy_gate),
+        ("Session Timeout", test_session_timeout),
+        ("Playback Interrupt", test_playback_interrupt),
+        ("Send Queue Overflow", test_send_queue_drops_oldest),
         ("AudioPlayer Playback", test_audio_playback),
         ("API Key Validation", test_api_key_validation),
         ("Assistant Init", test_assistant_with_key),